@@ -15,6 +15,7 @@ import asyncio
 import shutil
 import json
 import sys
+import re
 import os
 
 from fastmcp.server.auth.providers.azure import AzureProvider
@@ -27,6 +28,9 @@ load_dotenv()
 
 CommandResult: TypeAlias = Dict[str, Any]
 
+# Characters that could be used for command injection, matched in a single regex scan
+_FORBIDDEN_ARG_RE = re.compile("[;|&$`\n\r\x00]")
+
 # Configure enhanced logging to stderr to avoid interfering with stdio communication
 logging.basicConfig(
     level=logging.DEBUG,
@@ -90,10 +94,9 @@ def _validate_container_arg(arg: str) -> str:
         raise ValueError(f"Argument must be a string, got {type(arg).__name__}")
 
     # Disallow dangerous characters that could be used for command injection
-    forbidden_chars = [";", "|", "&", "$", "`", "\n", "\r", "\x00"]
-    for char in forbidden_chars:
-        if char in arg:
-            raise ValueError(f"Invalid character '{repr(char)}' in argument. ")
+    forbidden = _FORBIDDEN_ARG_RE.search(arg)
+    if forbidden:
+        raise ValueError(f"Invalid character '{repr(forbidden.group())}' in argument. ")
 
     # Additional check for shell metacharacters
     if arg.strip().startswith("-") and any(c in arg for c in ["$(", "${", "`"]):
@@ -134,7 +137,8 @@ async def run_container_command(*args: str) -> CommandResult:
         raise ValueError(f"Invalid command argument: {e}")
 
     cmd = ["container"] + validated_args
-    logger.info(f"Executing: {' '.join(cmd)}")
+    command = " ".join(cmd)
+    logger.info(f"Executing: {command}")
 
     try:
         process = await asyncio.create_subprocess_exec(
@@ -150,7 +154,7 @@ async def run_container_command(*args: str) -> CommandResult:
             "stdout": stdout_text,
             "stderr": stderr_text,
             "return_code": process.returncode,
-            "command": " ".join(cmd),
+            "command": command,
         }
 
         # Log command completion with detailed results
@@ -164,7 +168,7 @@ async def run_container_command(*args: str) -> CommandResult:
         return result
 
     except Exception as e:
-        error_msg = f"Exception executing command '{' '.join(cmd)}': {e}"
+        error_msg = f"Exception executing command '{command}': {e}"
         logger.error(f"{error_msg}")
         logger.error("Stack trace:", exc_info=True)
 
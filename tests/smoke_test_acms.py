@@ -1,48 +1,106 @@
 import pytest
-from unittest.mock import AsyncMock, patch
+import shlex
+import sys
+import os
+from unittest.mock import patch
+
+from acms import (
+    CommandResult,
+    parse_arguments,
+    format_command_result,
+    create_fastmcp_server,
+    run_container_command,
+    _validate_container_arg,
+    validate_array_parameter,
+    check_container_available,
+)
+
+
+class _FakeProc:
+    """Minimal stand-in for the process returned by asyncio.create_subprocess_exec."""
+
+    def __init__(self, stdout: bytes, stderr: bytes, returncode: int):
+        self._stdout = stdout
+        self._stderr = stderr
+        self.returncode = returncode
+
+    async def communicate(self):
+        return self._stdout, self._stderr
+
+
+@pytest.fixture
+def clean_env(monkeypatch):
+    """Empty os.environ for one test; monkeypatch restores it on teardown."""
+    for key in list(os.environ):
+        monkeypatch.delenv(key, raising=False)
+    return monkeypatch
+
+
+@pytest.fixture
+def fake_container_cli(tmp_path, monkeypatch):
+    """Install a shell script named `container` first on PATH with canned output."""
+
+    def install(stdout: str = "", stderr: str = "", returncode: int = 0):
+        script = tmp_path / "container"
+        script.write_text(
+            "#!/bin/sh\n"
+            f"printf '%s' {shlex.quote(stdout)}\n"
+            f"printf '%s' {shlex.quote(stderr)} >&2\n"
+            f"exit {returncode}\n",
+            encoding="utf-8",
+        )
+        script.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ.get('PATH', '')}")
+
+    return install
+
+
+@pytest.fixture(scope="module")
+def noauth_server():
+    """Build the unauthenticated server once for read-only assertions."""
+    return create_fastmcp_server(enable_auth=False)
+
+
+posix_only = pytest.mark.skipif(sys.platform == "win32", reason="requires a POSIX shell")
 
 
 class TestArgumentValidation:
     """Test argument validation functions."""
 
-    def test_validate_container_arg_accepts_valid_strings(self):
-        """Verify that valid arguments pass validation."""
-        from acms import _validate_container_arg
-
-        valid_args = [
+    @pytest.mark.parametrize(
+        "arg",
+        [
             "ubuntu",
             "list",
             "--all",
             "container-name",
             "/path/to/file",
             "key=value",
-        ]
-
-        for arg in valid_args:
-            result = _validate_container_arg(arg)
-            assert result == arg
-
-    def test_validate_container_arg_rejects_dangerous_chars(self):
-        """Verify that dangerous characters are rejected."""
-        from acms import _validate_container_arg
+        ],
+    )
+    def test_validate_container_arg_accepts_valid_strings(self, arg):
+        """Verify that valid arguments pass validation."""
+        result = _validate_container_arg(arg)
+        assert result == arg
 
-        dangerous_args = [
+    @pytest.mark.parametrize(
+        "arg",
+        [
             "test;rm -rf /",
             "test|cat /etc/passwd",
             "test&whoami",
             "test$PATH",
             "test`whoami`",
             "test\nrm -rf",
-        ]
-
-        for arg in dangerous_args:
-            with pytest.raises(ValueError, match="Invalid character"):
-                _validate_container_arg(arg)
+        ],
+    )
+    def test_validate_container_arg_rejects_dangerous_chars(self, arg):
+        """Verify that dangerous characters are rejected."""
+        with pytest.raises(ValueError, match="Invalid character"):
+            _validate_container_arg(arg)
 
     def test_validate_container_arg_rejects_non_strings(self):
         """Verify that non-string arguments are rejected."""
-        from acms import _validate_container_arg
-
         with pytest.raises(ValueError, match="must be a string"):
             _validate_container_arg(123)
 
@@ -55,53 +113,39 @@ class TestArrayParameterValidation:
 
     def test_validate_array_accepts_none(self):
         """Verify None is accepted as valid."""
-        from acms import validate_array_parameter
-
         result = validate_array_parameter(None, "test_param")
         assert result is None
 
     def test_validate_array_accepts_string_list(self):
         """Verify lists of strings are accepted."""
-        from acms import validate_array_parameter
-
         input_list = ["item1", "item2", "item3"]
         result = validate_array_parameter(input_list, "test_param")
         assert result == input_list
 
     def test_validate_array_accepts_json_string(self):
         """Verify JSON array strings are parsed correctly."""
-        from acms import validate_array_parameter
-
         json_str = '["item1", "item2", "item3"]'
         result = validate_array_parameter(json_str, "test_param")
         assert result == ["item1", "item2", "item3"]
 
     def test_validate_array_converts_single_string(self):
         """Verify single non-JSON strings are converted to list."""
-        from acms import validate_array_parameter
-
         result = validate_array_parameter("single-item", "test_param")
         assert result == ["single-item"]
 
     def test_validate_array_rejects_empty_list(self):
         """Verify empty arrays are rejected."""
-        from acms import validate_array_parameter
-
         with pytest.raises(ValueError, match="cannot be an empty array"):
             validate_array_parameter([], "test_param")
 
     def test_validate_array_rejects_mixed_types(self):
         """Verify lists with non-string elements are rejected."""
-        from acms import validate_array_parameter
-
         mixed_list = ["string", 123, "another"]
         with pytest.raises(ValueError, match="must be a list of strings"):
             validate_array_parameter(mixed_list, "test_param")
 
     def test_validate_array_rejects_invalid_json(self):
         """Verify invalid JSON objects are handled correctly."""
-        from acms import validate_array_parameter
-
         # JSON object instead of array
         json_obj = '{"key": "value"}'
         with pytest.raises(ValueError, match="must be an array of strings"):
@@ -113,8 +157,6 @@ class TestCommandResultFormatting:
 
     def test_format_successful_command_result(self):
         """Verify successful command results are formatted correctly."""
-        from acms import format_command_result
-
         result = {
             "command": "container list",
             "return_code": 0,
@@ -129,8 +171,6 @@ class TestCommandResultFormatting:
 
     def test_format_failed_command_result(self):
         """Verify failed command results are formatted correctly."""
-        from acms import format_command_result
-
         result = {
             "command": "container invalid",
             "return_code": 1,
@@ -145,8 +185,6 @@ class TestCommandResultFormatting:
 
     def test_format_command_result_with_both_outputs(self):
         """Verify command results with both stdout and stderr are formatted correctly."""
-        from acms import format_command_result
-
         result = {
             "command": "container run ubuntu",
             "return_code": 0,
@@ -165,8 +203,6 @@ class TestContainerAvailabilityCheck:
     @patch("shutil.which")
     def test_check_container_available_when_present(self, mock_which):
         """Verify availability check returns True when container CLI exists."""
-        from acms import check_container_available
-
         mock_which.return_value = "/usr/local/bin/container"
         result = check_container_available()
         assert result is True
@@ -175,8 +211,6 @@ class TestContainerAvailabilityCheck:
     @patch("shutil.which")
     def test_check_container_available_when_absent(self, mock_which):
         """Verify availability check returns False when container CLI missing."""
-        from acms import check_container_available
-
         mock_which.return_value = None
         result = check_container_available()
         assert result is False
@@ -186,26 +220,16 @@ class TestContainerAvailabilityCheck:
 class TestRunContainerCommand:
     """Test the core container command execution function."""
 
-    @pytest.mark.asyncio
     async def test_run_container_command_validation(self):
         """Verify command arguments are validated before execution."""
-        from acms import run_container_command
-
         # Should raise ValueError for dangerous arguments
         with pytest.raises(ValueError, match="Invalid command argument"):
             await run_container_command("list", "--all;rm -rf /")
 
-    @pytest.mark.asyncio
-    @patch("asyncio.create_subprocess_exec")
-    async def test_run_container_command_success(self, mock_subprocess):
+    @posix_only
+    async def test_run_container_command_success(self, fake_container_cli):
         """Verify successful command execution returns correct result."""
-        from acms import run_container_command
-
-        # Mock process
-        mock_process = AsyncMock()
-        mock_process.communicate = AsyncMock(return_value=(b"success output", b""))
-        mock_process.returncode = 0
-        mock_subprocess.return_value = mock_process
+        fake_container_cli(stdout="success output")
 
         result = await run_container_command("list")
 
@@ -214,17 +238,11 @@ class TestRunContainerCommand:
         assert result["stderr"] == ""
         assert "container list" in result["command"]
 
-    @pytest.mark.asyncio
-    @patch("asyncio.create_subprocess_exec")
-    async def test_run_container_command_failure(self, mock_subprocess):
+    @posix_only
+    async def test_run_container_command_failure(self, fake_container_cli):
         """Verify failed command execution returns correct result."""
-        from acms import run_container_command
-
-        # Mock process with error
-        mock_process = AsyncMock()
-        mock_process.communicate = AsyncMock(return_value=(b"", b"error message"))
-        mock_process.returncode = 1
-        mock_subprocess.return_value = mock_process
+        # Process with error
+        fake_container_cli(stderr="error message", returncode=1)
 
         result = await run_container_command("invalid")
 
@@ -235,38 +253,25 @@ class TestRunContainerCommand:
 class TestFastMCPServerCreation:
     """Test FastMCP server creation and configuration."""
 
-    @patch.dict("os.environ", {}, clear=True)
-    def test_create_server_without_auth(self):
+    def test_create_server_without_auth(self, noauth_server):
         """Verify server can be created without authentication."""
-        from acms import create_fastmcp_server
+        assert noauth_server is not None
+        assert hasattr(noauth_server, "http_app")
 
-        server = create_fastmcp_server(enable_auth=False)
-        assert server is not None
-        assert hasattr(server, "http_app")
-
-    @patch.dict(
-        "os.environ",
-        {
-            "ENTRA_TENANT_ID": "test-tenant",
-            "ENTRA_CLIENT_ID": "test-client",
-            "ENTRA_CLIENT_SECRET": "test-secret",
-            "ENTRA_REQUIRED_SCOPES": "scope1 scope2",
-        },
-    )
-    def test_create_server_with_auth_env_vars(self):
+    def test_create_server_with_auth_env_vars(self, clean_env):
         """Verify server can be created with auth when env vars are set."""
-        from acms import create_fastmcp_server
+        clean_env.setenv("ENTRA_TENANT_ID", "test-tenant")
+        clean_env.setenv("ENTRA_CLIENT_ID", "test-client")
+        clean_env.setenv("ENTRA_CLIENT_SECRET", "test-secret")
+        clean_env.setenv("ENTRA_REQUIRED_SCOPES", "scope1 scope2")
 
         server = create_fastmcp_server(
             enable_auth=True, resource_server_url="http://localhost:8765"
         )
         assert server is not None
 
-    @patch.dict("os.environ", {}, clear=True)
-    def test_create_server_with_auth_missing_env_vars(self):
+    def test_create_server_with_auth_missing_env_vars(self, clean_env):
         """Verify server creation fails with auth enabled but missing env vars."""
-        from acms import create_fastmcp_server
-
         with pytest.raises(SystemExit):
             create_fastmcp_server(
                 enable_auth=True, resource_server_url="http://localhost:8765"
@@ -278,8 +283,6 @@ class TestArgumentParsing:
 
     def test_parse_arguments_defaults(self):
         """Verify default arguments are set correctly."""
-        from acms import parse_arguments
-
         with patch("sys.argv", ["acms.py"]):
             args = parse_arguments()
             assert args.port == 8765
@@ -289,32 +292,24 @@ class TestArgumentParsing:
 
     def test_parse_arguments_custom_port(self):
         """Verify custom port is parsed correctly."""
-        from acms import parse_arguments
-
         with patch("sys.argv", ["acms.py", "--port", "9000"]):
             args = parse_arguments()
             assert args.port == 9000
 
     def test_parse_arguments_ssl_enabled(self):
         """Verify SSL flag is parsed correctly."""
-        from acms import parse_arguments
-
         with patch("sys.argv", ["acms.py", "--ssl"]):
             args = parse_arguments()
             assert args.ssl is True
 
     def test_parse_arguments_auth_enabled(self):
         """Verify auth flag is parsed correctly."""
-        from acms import parse_arguments
-
         with patch("sys.argv", ["acms.py", "--enable-auth"]):
             args = parse_arguments()
             assert args.enable_auth is True
 
     def test_parse_arguments_custom_host(self):
         """Verify custom host is parsed correctly."""
-        from acms import parse_arguments
-
         with patch("sys.argv", ["acms.py", "--host", "0.0.0.0"]):
             args = parse_arguments()
             assert args.host == "0.0.0.0"
@@ -337,64 +332,51 @@ class TestServerConfiguration:
 
     def test_command_result_type_alias(self):
         """Verify CommandResult type alias is defined."""
-        from acms import CommandResult
-
         assert CommandResult is not None
 
 
 class TestEdgeCases:
     """Test edge cases and error handling."""
 
-    @pytest.mark.asyncio
-    @patch("asyncio.create_subprocess_exec")
-    async def test_run_container_command_handles_unicode(self, mock_subprocess):
+    @posix_only
+    async def test_run_container_command_handles_unicode(self, fake_container_cli):
         """Verify command handles unicode output correctly."""
-        from acms import run_container_command
-
-        # Mock process with unicode output
-        mock_process = AsyncMock()
-        mock_process.communicate = AsyncMock(
-            return_value=("Test 你好 🚀".encode("utf-8"), b"")
-        )
-        mock_process.returncode = 0
-        mock_subprocess.return_value = mock_process
+        # Process with unicode output
+        fake_container_cli(stdout="Test 你好 🚀")
 
         result = await run_container_command("list")
         assert "你好" in result["stdout"]
         assert "🚀" in result["stdout"]
 
-    @pytest.mark.asyncio
-    @patch("asyncio.create_subprocess_exec")
-    async def test_run_container_command_handles_invalid_utf8(self, mock_subprocess):
+    async def test_run_container_command_handles_invalid_utf8(self, monkeypatch):
         """Verify command handles invalid UTF-8 gracefully."""
-        from acms import run_container_command
 
-        # Mock process with invalid UTF-8
-        mock_process = AsyncMock()
-        mock_process.communicate = AsyncMock(return_value=(b"\xff\xfe", b""))
-        mock_process.returncode = 0
-        mock_subprocess.return_value = mock_process
+        # Process with invalid UTF-8
+        async def fake_exec(*args, **kwargs):
+            return _FakeProc(b"\xff\xfe", b"", 0)
+
+        monkeypatch.setattr("asyncio.create_subprocess_exec", fake_exec)
 
         result = await run_container_command("list")
         # Should not raise, uses errors='replace'
         assert result["stdout"] is not None
 
-    def test_validate_array_parameter_edge_cases(self):
+    @pytest.mark.parametrize(
+        "param, expected",
+        [
+            # Whitespace handling in JSON
+            ('  ["a", "b"]  ', ["a", "b"]),
+            # Single element array
+            (["single"], ["single"]),
+        ],
+    )
+    def test_validate_array_parameter_edge_cases(self, param, expected):
         """Test edge cases in array parameter validation."""
-        from acms import validate_array_parameter
-
-        # Whitespace handling in JSON
-        result = validate_array_parameter('  ["a", "b"]  ', "test")
-        assert result == ["a", "b"]
-
-        # Single element array
-        result = validate_array_parameter(["single"], "test")
-        assert result == ["single"]
+        result = validate_array_parameter(param, "test")
+        assert result == expected
 
     def test_format_command_result_handles_missing_fields(self):
         """Verify formatter handles results with missing optional fields."""
-        from acms import format_command_result
-
         minimal_result = {
             "command": "test",
             "return_code": 0,
@@ -19,6 +19,20 @@ logging.basicConfig(
 )
 logger = logging.getLogger("mcp-server-network-debug")
 
+# JSON-RPC request bodies are static, so encode them once at import time
+MCP_INITIALIZE_BODY: bytes = json.dumps({
+    "method": "initialize", "params": {"protocolVersion": "2025-06-18", "capabilities": {},"clientInfo": {"name": "test-mcp", "title": "test-mcp", "version": "0.1"}}, "jsonrpc": "2.0", "id": "0"}).encode('utf-8')
+
+MCP_PING_BODY: bytes = json.dumps({
+    "method": "ping", "jsonrpc": "2.0", "id": "123"
+}).encode('utf-8')
+
+MCP_HEADERS: dict = {
+    'Content-Type': 'application/json',
+    'Accept': 'application/json, text/event-stream',
+    'Connection': 'keep-alive',
+}
+
 def test_dns_resolution(hostname: str) -> Optional[str]:
 
     try:
@@ -58,21 +72,12 @@ def test_mcp_initialize(base_url: str) -> bool:
 
     url = base_url + "/mcp"
 
-    mcpInitializationData = {
-        "method": "initialize", "params": {"protocolVersion": "2025-06-18", "capabilities": {},"clientInfo": {"name": "test-mcp", "title": "test-mcp", "version": "0.1"}}, "jsonrpc": "2.0", "id": "0"}
-
-    json_string = json.dumps(mcpInitializationData)
-    encoded_data = json_string.encode('utf-8')
-
     try:
         logger.info(f"Testing MCP initialization: {url}")
 
         start_time = time.time()
-        request = urllib.request.Request(url)
-        request.add_header('Content-Type', 'application/json', )
-        request.add_header('Accept', 'application/json, text/event-stream')
-        request.add_header('Connection', 'keep-alive')
-        with urllib.request.urlopen(request, data=encoded_data) as response:
+        request = urllib.request.Request(url, headers=MCP_HEADERS)
+        with urllib.request.urlopen(request, data=MCP_INITIALIZE_BODY) as response:
             duration = time.time() - start_time
             status_code = response.getcode()
             headers = dict(response.getheaders())
@@ -100,21 +105,12 @@ def test_mcp_ping(base_url: str) -> bool:
 
     url = base_url + "/mcp"
 
-    mcpPingData = {
-        "method": "ping", "jsonrpc": "2.0", "id": "123"
-    }
-
-    json_string = json.dumps(mcpPingData)
-    encoded_data = json_string.encode('utf-8')
     try:
         logger.info(f"Testing MCP ping request to: {url}")
 
         start_time = time.time()
-        request = urllib.request.Request(url)
-        request.add_header('Content-Type', 'application/json', )
-        request.add_header('Accept', 'application/json, text/event-stream')
-        request.add_header('Connection', 'keep-alive')
-        with urllib.request.urlopen(request, data=encoded_data) as response:
+        request = urllib.request.Request(url, headers=MCP_HEADERS)
+        with urllib.request.urlopen(request, data=MCP_PING_BODY) as response:
             duration = time.time() - start_time
             status_code = response.getcode()
             headers = dict(response.getheaders())
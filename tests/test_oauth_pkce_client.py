@@ -3,58 +3,68 @@ from fastmcp import Client
 
 import httpx
 
+MCP_HEADERS = {
+    "Accept": "application/json, text/event-stream",
+    "Content-Type": "application/json",
+}
 
-async def test_unauthenticated_request(mcp_server_url: str):
+_BAR = "=" * 50
+
+
+def banner(title: str):
+    """Print a section banner with a single write."""
+    print(f"{_BAR}\n{title}\n{_BAR}")
+
+
+async def test_unauthenticated_request(mcp_url: str, client: httpx.AsyncClient):
     """
     Test making an unauthenticated request to the ACMS server.
     """
-    print("=" * 50)
-    print("Testing Unauthenticated Request")
-    print("=" * 50)
+    banner("Testing Unauthenticated Request")
 
-    headers = {
-        "Accept": "application/json, text/event-stream",
-        "Content-Type": "application/json",
-    }
+    try:
+        response = await client.post(mcp_url)
 
-    async with httpx.AsyncClient() as client:
-        try:
-            response = await client.post(f"{mcp_server_url}/mcp", headers=headers)
+        if response.status_code == 401:
+            print("Server correctly rejected unauthenticated request (401)")
+            print(f"Response Headers: {dict(response.headers)}")
+            print(f"WWW-Authenticate: {response.headers.get('WWW-Authenticate', 'Not present')}")
+        elif response.status_code == 200:
+            print("Server accepted unauthenticated request (OAuth may be disabled)")
+        else:
+            print(f"Unexpected response: {response.status_code}")
+            print(f"Response: {response.text}")
 
-            if response.status_code == 401:
-                print("Server correctly rejected unauthenticated request (401)")
-                print(f"Response Headers: {dict(response.headers)}")
-                print(
-                    f"WWW-Authenticate: {response.headers.get('WWW-Authenticate', 'Not present')}"
-                )
-            elif response.status_code == 200:
-                print("Server accepted unauthenticated request (OAuth may be disabled)")
-            else:
-                print(f"Unexpected response: {response.status_code}")
-                print(f"Response: {response.text}")
+    except httpx.RequestError as e:
+        print(f"Request failed: {e}")
 
-        except httpx.HTTPError as e:
-            print(f"Request failed: {e}")
+
+async def call_authenticated_tool(mcp_server_url: str):
+    """
+    Test calling a tool on the ACMS server through the OAuth PKCE flow.
+    """
+    async with Client(mcp_server_url, auth="oauth") as client:
+        result = await client.call_tool("acms_system_status")
+        print(result)
 
 
 async def main():
     """Main function."""
 
-    mcp_server_url = "http://localhost:8765/mcp"
+    # Full MCP endpoint, used as-is by both the probe and the OAuth client
+    mcp_url = "http://localhost:8765/mcp"
 
-    try:
-        # Test 1: Unauthenticated request (should fail if OAuth is enabled)
-        await test_unauthenticated_request(mcp_server_url)
-
-        async with Client("http://localhost:8765/mcp", auth="oauth") as client:
-            result = await client.call_tool("acms_system_status")
-            print(result)
-
-    except Exception as e:
-        print("=" * 50)
-        print("Test Failed")
-        print(f"Error: {e}")
-        print("=" * 50)
+    # main() owns the raw HTTP client and injects it into the probe
+    async with httpx.AsyncClient(timeout=30.0, headers=MCP_HEADERS) as http_client:
+        try:
+            # Test 1: Unauthenticated request (should fail if OAuth is enabled)
+            await test_unauthenticated_request(mcp_url, http_client)
+
+            # Test 2: Authenticated tool call through the OAuth PKCE flow
+            await call_authenticated_tool(mcp_url)
+
+        except Exception as e:
+            banner(f"Test Failed\nError: {e}")
 
 
 if __name__ == "__main__":